@@ -1,10 +1,150 @@
+import csv
+from typing import Callable, Iterable, Iterator
+
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+
+from market.models import Category, Product, UserProfile, Cart, CartItem, Order, Review
+
+EXPORT_CHUNK_SIZE = 2000
+# Below this many rows an exact COUNT(*) is cheap and the estimate too rough
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+class Echo:
+    """File-like object whose write() returns the value instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(filename: str, header: Iterable, get_rows: Callable[[], Iterator[Iterable]]) -> StreamingHttpResponse:
+    """
+    Build a CSV response that is written row by row while it is sent.
+
+    Parameters:
+        filename (str): Name of the downloaded file.
+        header (Iterable): The header row.
+        get_rows (Callable): Returns an iterator over the data rows. It is called only once the
+            response starts streaming, and no transaction is held open during the download.
+
+    Returns:
+        StreamingHttpResponse: The CSV response.
+    """
+    writer = csv.writer(Echo())
+
+    def lines() -> Iterator[str]:
+        yield writer.writerow(header)
+        for row in get_rows():
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(lines(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reads the row count of large tables from PostgreSQL statistics.
+
+    pg_class.reltuples describes the whole table, so the estimate is only used for
+    unfiltered querysets; filtered ones, other backends, small tables and tables that
+    were never analyzed (reltuples = -1) get an exact COUNT(*).
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                # regclass resolves the name through search_path, unlike a match on relname
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [connection.ops.quote_name(queryset.model._meta.db_table)],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+        return super().count
+
+
+class ModelAdminEstimateCountMixin:
+    """Mixin for ModelAdmin classes whose tables are too large to COUNT(*) on every page."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
-from market.models import Category, Product, UserProfile, Cart, Order, Review
 
 admin.site.register(Category)
-admin.site.register(Product)
-admin.site.register(Cart)
-admin.site.register(UserProfile)
-admin.site.register(Order)
-admin.site.register(Review)
+
+
+@admin.register(Product)
+class ProductAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
+    list_display = ('name', 'price', 'category', 'user')
+    list_select_related = ('category', 'user')
+    raw_id_fields = ('category', 'user')
+    list_per_page = 50
+    search_fields = ('name',)
+    actions = ('export_csv',)
+
+    @admin.action(description='Export selected products to CSV')
+    def export_csv(self, request, queryset):
+        def rows():
+            products = queryset.select_related('user', 'category').iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            for product in products:
+                yield product.id, product.name, product.price, product.category.name, product.user.username
+
+        return stream_csv('products.csv', ('id', 'name', 'price', 'category', 'user'), rows)
+
+
+class CartItemInline(admin.TabularInline):
+    model = CartItem
+    raw_id_fields = ('product',)
+    extra = 0
+
+
+@admin.register(Cart)
+class CartAdmin(admin.ModelAdmin):
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    inlines = (CartItemInline,)
+    list_per_page = 50
+    show_full_result_count = False
+
+
+@admin.register(UserProfile)
+class UserProfileAdmin(admin.ModelAdmin):
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    list_per_page = 50
+    show_full_result_count = False
+
+
+@admin.register(Order)
+class OrderAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
+    list_display = ('__str__', 'status', 'total_amount')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    filter_horizontal = ('products',)
+    list_per_page = 50
+    actions = ('export_csv',)
+
+    @admin.action(description='Export selected orders to CSV')
+    def export_csv(self, request, queryset):
+        def rows():
+            orders = queryset.select_related('user').iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            for order in orders:
+                yield order.id, order.user.username, order.status, order.total_amount
+
+        return stream_csv('orders.csv', ('id', 'user', 'status', 'total_amount'), rows)
+
+
+@admin.register(Review)
+class ReviewAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
+    list_display = ('__str__', 'rating')
+    list_select_related = ('product', 'user')
+    raw_id_fields = ('product', 'user')
+    list_per_page = 50
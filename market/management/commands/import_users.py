@@ -0,0 +1,49 @@
+import csv
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from market.signals import bulk_create_users
+from user_auth.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = 'Import users from a CSV file (username, email, password) with their carts and profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='CSV file with a header row: username,email,password')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per INSERT statement')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_file'], newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        except OSError as e:
+            raise CommandError(f'Cannot read {options["csv_file"]}: {e}')
+
+        usernames = [row.get('username') for row in rows]
+        duplicates = sorted(username for username, n in Counter(usernames).items() if username and n > 1)
+        if duplicates:
+            raise CommandError(f'Duplicate usernames in CSV: {", ".join(duplicates)}')
+        existing = sorted(CustomUser.objects.filter(username__in=usernames).values_list('username', flat=True))
+        if existing:
+            raise CommandError(f'Users already exist: {", ".join(existing)}')
+
+        users = []
+        for row in rows:
+            if not row.get('username'):
+                raise CommandError(f'Row without username: {row}')
+            user = CustomUser(username=row['username'], email=row.get('email') or '')
+            if row.get('password'):
+                user.set_password(row['password'])
+            else:
+                user.set_unusable_password()
+            users.append(user)
+
+        try:
+            users = bulk_create_users(users, batch_size=options['batch_size'])
+        except IntegrityError as e:
+            # A user created concurrently after the checks above
+            raise CommandError(f'Cannot import users: {e}')
+        self.stdout.write(self.style.SUCCESS(f'Imported {len(users)} users'))
@@ -0,0 +1,38 @@
+from typing import Callable, Optional
+
+from django.http import HttpRequest, HttpResponse
+from django.utils.functional import SimpleLazyObject
+
+from market.models import Cart
+
+
+def get_cart(request: HttpRequest) -> Optional[Cart]:
+    """
+    Fetch the cart of the user making the request.
+
+    Returns:
+        Optional[Cart]: The user's cart, or None for anonymous users and users without a cart.
+    """
+    if not request.user.is_authenticated:
+        return None
+    try:
+        return Cart.objects.get(user=request.user)
+    except Cart.DoesNotExist:
+        return None
+
+
+class CartAttachMiddleware:
+    """
+    Middleware that attaches the current user's cart to the request as request.cart.
+
+    The cart is loaded lazily on first access, so a request runs at most one query for it
+    and views that never touch the cart run none. The user is resolved at access time,
+    which lets DRF authentication in the view take effect first.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        request.cart = SimpleLazyObject(lambda: get_cart(request))
+        return self.get_response(request)
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.4 on 2026-10-15 09:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_cart_products(apps, schema_editor):
+    Cart = apps.get_model('market', 'Cart')
+    CartItem = apps.get_model('market', 'CartItem')
+    CartProducts = Cart.products.through
+    CartItem.objects.bulk_create(
+        [CartItem(cart_id=row.cart_id, product_id=row.product_id) for row in CartProducts.objects.iterator()],
+        batch_size=500,
+    )
+
+
+def copy_cart_items(apps, schema_editor):
+    Cart = apps.get_model('market', 'Cart')
+    CartItem = apps.get_model('market', 'CartItem')
+    CartProducts = Cart.products.through
+    CartProducts.objects.bulk_create(
+        [CartProducts(cart_id=item.cart_id, product_id=item.product_id) for item in CartItem.objects.iterator()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0007_product_review_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CartItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('added_at', models.DateTimeField(auto_now_add=True)),
+                ('cart', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='market.cart')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='market.product')),
+            ],
+            options={
+                'unique_together': {('cart', 'product')},
+            },
+        ),
+        migrations.RunPython(copy_cart_products, copy_cart_items),
+        # Django can't add through= to an existing M2M, so the auto-created table is replaced
+        migrations.RemoveField(
+            model_name='cart',
+            name='products',
+        ),
+        migrations.AddField(
+            model_name='cart',
+            name='products',
+            field=models.ManyToManyField(blank=True, through='market.CartItem', to='market.product'),
+        ),
+    ]
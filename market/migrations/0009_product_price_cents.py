@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-15 09:20
+
+import django.db.models.expressions
+import django.db.models.functions.math
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0008_cartitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='price_cents',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.math.Round(django.db.models.expressions.CombinedExpression(models.F('price'), '*', models.Value(100))), output_field=models.BigIntegerField()),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Avg, Count, F
+from django.db.models.functions import Round
 from django.contrib.auth.models import AbstractUser
 
 from user_auth.models import CustomUser
@@ -12,6 +14,7 @@ class Product(models.Model):
         name (str): The name of the product.
         description (str): The description of the product.
         price (Decimal): The price of the product.
+        price_cents (int): The price of the product in cents, generated by the database from price.
         category (Category): The category to which the product belongs.
         user (CustomUser): The user who added the product.
     """
@@ -19,12 +22,31 @@ class Product(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    price_cents = models.GeneratedField(
+        expression=Round(F('price') * 100),
+        output_field=models.BigIntegerField(),
+        db_persist=True,
+    )
     category = models.ForeignKey('Category', on_delete=models.CASCADE)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'category']),
+        ]
+
     def __str__(self):
         return self.name
 
+    def review_stats(self) -> dict:
+        """
+        Aggregate the product's reviews in the database.
+
+        Returns:
+            dict: The average rating ('avg', None without reviews) and the number of reviews ('count').
+        """
+        return self.review_set.aggregate(avg=Avg('rating'), count=Count('id'))
+
 
 
 class Order(models.Model):
@@ -95,6 +117,11 @@ class Review(models.Model):
     text = models.TextField()
     rating = models.PositiveIntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['product', 'rating']),
+        ]
+
     def __str__(self):
         return f"Review {self.id} by {self.user} for product {self.product.name}"
 
@@ -124,12 +151,29 @@ class Cart(models.Model):
         products (ManyToManyField): A many-to-many relationship with products.
     """
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
-    products = models.ManyToManyField(Product, null=True, blank=True)
+    products = models.ManyToManyField(Product, through='CartItem', blank=True)
 
     def __str__(self):
         return self.user.username
 
 
+class CartItem(models.Model):
+    """
+    Model representing a product placed in a cart.
+
+    Attributes:
+        cart (Cart): The cart containing the product.
+        product (Product): The product in the cart.
+        added_at (datetime): When the product was added to the cart.
+    """
+    cart = models.ForeignKey(Cart, on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    added_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [('cart', 'product')]
+
+
 class PromoCode(models.Model):
     """
     Model representing promotional codes.
@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Cursor pagination ordered by primary key, newest first.
+
+    Uses a keyset condition on the indexed id column instead of OFFSET.
+    """
+    ordering = '-id'
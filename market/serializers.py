@@ -18,6 +18,17 @@ class ProductSerializer(serializers.ModelSerializer):
         return Product.objects.create(**validated_data)
 
 
+class ProductDetailSerializer(ProductSerializer):
+    # Средняя оценка и число отзывов считаются в БД; в списке товаров не выводятся, чтобы не было N+1
+    review_stats = serializers.SerializerMethodField()
+
+    class Meta(ProductSerializer.Meta):
+        fields = ProductSerializer.Meta.fields + ('review_stats',)
+
+    def get_review_stats(self, obj):
+        return obj.review_stats()
+
+
 class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
@@ -47,6 +58,8 @@ class OrderSerializer(serializers.ModelSerializer):
 
 class CartSerializer(serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.username')
+    # M2M fields with an explicit through model are read-only by default in DRF
+    products = serializers.PrimaryKeyRelatedField(many=True, required=False, queryset=Product.objects.all())
     products_names = serializers.SerializerMethodField()
     read_only_fields = ['user', 'user_name']  # Помечаем поле пользователя как только для чтения
 
@@ -62,3 +75,10 @@ class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = '__all__'
+
+
+class ReviewBulkSerializer(serializers.Serializer):
+    # Товар передаётся как id: существование проверяется одним запросом на всю пачку
+    product_id = serializers.IntegerField()
+    text = serializers.CharField()
+    rating = serializers.IntegerField(min_value=0)
@@ -1,13 +1,68 @@
-from django.db.models.signals import post_save
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from user_auth.models import CustomUser
-from .models import Cart, UserProfile
+from .models import Cart, UserProfile, Product, Review
+
+_bulk_user_creation = ContextVar('bulk_user_creation', default=False)
+
+
+@contextmanager
+def bulk_user_creation() -> Iterator[None]:
+    """
+    Context manager that disables the per-user cart/profile signal.
+
+    Code running inside it is responsible for creating carts and profiles itself.
+    """
+    token = _bulk_user_creation.set(True)
+    try:
+        yield
+    finally:
+        _bulk_user_creation.reset(token)
+
+
+def bulk_create_users(users: List[CustomUser], batch_size: int = 500) -> List[CustomUser]:
+    """
+    Create users together with their carts and profiles using batched INSERTs.
+
+    bulk_create() does not send post_save, so carts and profiles are created here.
+
+    Parameters:
+        users (List[CustomUser]): Unsaved user instances.
+        batch_size (int): Number of rows per INSERT statement.
+
+    Returns:
+        List[CustomUser]: The created users.
+    """
+    with transaction.atomic():
+        users = CustomUser.objects.bulk_create(users, batch_size=batch_size)
+        Cart.objects.bulk_create([Cart(user_id=user.id) for user in users], batch_size=batch_size)
+        UserProfile.objects.bulk_create([UserProfile(user_id=user.id) for user in users], batch_size=batch_size)
+    return users
 
 
 @receiver(post_save, sender=CustomUser)
 def create_user_cart_and_profile(sender, instance, created, **kwargs):
+    # Фикстуры и массовое создание пользователей создают корзины и профили сами
+    if kwargs.get('raw') or _bulk_user_creation.get():
+        return
     if created:
         # Создание корзины для нового пользователя
         Cart.objects.create(user=instance)
         # Создание профиля пользователя
         UserProfile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_product_cache(sender, instance, **kwargs):
+    # Сбрасываем закэшированные списки и карточки товаров (с оценками отзывов) после коммита,
+    # иначе параллельный GET успеет закэшировать старую строку
+    transaction.on_commit(caches['products'].clear)
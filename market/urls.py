@@ -22,6 +22,7 @@ urlpatterns = [
 
     path('create_review/<int:product_id>', views.CreateReviewView.as_view(), name='create_review'),
     path('delete_review/<int:review_id>', views.DeleteReviewView.as_view(), name='delete_review'),
+    path('bulk_reviews/', views.ReviewBulkCreateView.as_view(), name='bulk_reviews'),
 
     path('', include(router.urls), name='my_products'),
 ]
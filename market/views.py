@@ -1,15 +1,56 @@
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Union
+from urllib.parse import urlencode
 
-from django.db.models import QuerySet
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import QuerySet, prefetch_related_objects
 from rest_framework import generics, viewsets, status
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from market.models import Product, Order, Cart, Review
-from market.serializers import ProductSerializer, OrderSerializer, CartSerializer, ReviewSerializer
+from market.serializers import ProductSerializer, ProductDetailSerializer, OrderSerializer, CartSerializer, ReviewSerializer, ReviewBulkSerializer
 from market.permissions import IsOwnerOrReadOnly, IsSellerOrReadOnly, IsOwner
 
 
+# Query parameters that change the serialized product data
+PRODUCT_CACHE_PARAMS = ('cursor', 'format')
+
+
+def get_cached_product_data(request, timeout: int, get_data: Callable[[], Any]) -> Any:
+    """
+    Return serialized product data from the 'products' cache, computing it on a miss.
+
+    Only the serialized data is cached, never the rendered response, so the output stays
+    per-user (browsable API) and no client-side caching headers are sent. Requests with
+    query parameters other than PRODUCT_CACHE_PARAMS bypass the cache, so arbitrary
+    parameters can neither fill it nor end up in cached pagination links.
+
+    Parameters:
+        request (Request): The request; its host, path and PRODUCT_CACHE_PARAMS form the cache key.
+        timeout (int): Cache lifetime in seconds.
+        get_data (Callable): Produces the serialized data on a cache miss.
+
+    Returns:
+        Any: The serialized data.
+    """
+    params = request.query_params
+    if any(name not in PRODUCT_CACHE_PARAMS for name in params):
+        return get_data()
+
+    cache = caches['products']
+    key = 'products:{}{}?{}'.format(
+        request.get_host(),
+        request.path,
+        urlencode([(name, params[name]) for name in PRODUCT_CACHE_PARAMS if name in params]),
+    )
+    data = cache.get(key)
+    if data is None:
+        data = get_data()
+        cache.set(key, data, timeout)
+    return data
+
+
 class ProductListCreate(generics.ListCreateAPIView):
     """
     API view to list and create products.
@@ -23,6 +64,17 @@ class ProductListCreate(generics.ListCreateAPIView):
     serializer_class = ProductSerializer
     permission_classes = [IsSellerOrReadOnly]
 
+    def list(self, request, *args, **kwargs) -> Response:
+        """
+        List products, serving the serialized page from the cache when possible.
+
+        Returns:
+            Response: The (paginated) list of products.
+        """
+        get_list = super().list
+        data = get_cached_product_data(request, 60, lambda: get_list(request, *args, **kwargs).data)
+        return Response(data)
+
 
 class ProductDetail(generics.RetrieveAPIView):
     """
@@ -34,9 +86,20 @@ class ProductDetail(generics.RetrieveAPIView):
         permission_classes: List of permission classes required for accessing this view.
     """
     queryset = Product.objects.all()
-    serializer_class = ProductSerializer
+    serializer_class = ProductDetailSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    def retrieve(self, request, *args, **kwargs) -> Response:
+        """
+        Retrieve a product, serving the serialized data from the cache when possible.
+
+        Returns:
+            Response: The product.
+        """
+        get_product = super().retrieve
+        data = get_cached_product_data(request, 300, lambda: get_product(request, *args, **kwargs).data)
+        return Response(data)
+
 
 class ProductRetrieveUpdateDestroyViewSet(viewsets.ModelViewSet):
     """
@@ -83,17 +146,17 @@ class AddProductToCart(APIView):
         """
         user = request.user
         if user.is_authenticated:
-            try:
-                product = Product.objects.get(id=product_id)
-            except Product.DoesNotExist:
+            if not Product.objects.filter(id=product_id).exists():
                 return Response({'message': 'Product does not exist'}, status=status.HTTP_404_NOT_FOUND)
         else:
             return Response({'message': 'User is not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
 
-        cart = Cart.objects.get(user=user)
-        cart.products.add(product)
-        cart.save()
+        cart = request.cart
+        if not cart:
+            return Response({'message': 'Cart does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        cart.products.add(product_id)
 
+        prefetch_related_objects([cart], 'products')
         serializer = CartSerializer(cart)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -119,11 +182,11 @@ class CartDetail(generics.RetrieveUpdateAPIView):
         """
         user = self.request.user
         if user.is_authenticated:
-            try:
-                cart = Cart.objects.get(user=user)
-                return cart
-            except Cart.DoesNotExist:
+            cart = self.request.cart
+            if not cart:
                 return Response({'message': 'Cart does not exist'}, status=status.HTTP_404_NOT_FOUND)
+            prefetch_related_objects([cart], 'products')
+            return cart
         else:
             return Response({'message': 'User is not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
 
@@ -147,20 +210,37 @@ class CreateOrderFromCart(APIView):
             Response: Response object indicating the result of the operation.
         """
         user = request.user
-        try:
-            cart = Cart.objects.get(user=user)
-        except Cart.DoesNotExist:
+        cart = request.cart
+        if not cart:
             return Response({'message': 'Cart does not exist'}, status=status.HTTP_404_NOT_FOUND)
 
-        order = Order.objects.create(user=user, total_amount=0)
-        total_amount = 0
-        for product in cart.products.all():
-            total_amount += product.price
-            order.products.add(product)
-        order.total_amount = total_amount
-        order.save()
-
-        cart.products.clear()
+        with transaction.atomic():
+            order = Order.objects.create(user=user, total_amount=0)
+            order_products = connection.ops.quote_name(Order.products.through._meta.db_table)
+            cart_products = connection.ops.quote_name(Cart.products.through._meta.db_table)
+            products = connection.ops.quote_name(Product._meta.db_table)
+            orders = connection.ops.quote_name(Order._meta.db_table)
+            with connection.cursor() as cursor:
+                # Copy the cart rows straight into the order in the database
+                cursor.execute(
+                    f'INSERT INTO {order_products} (order_id, product_id) '
+                    f'SELECT %s, product_id FROM {cart_products} WHERE cart_id = %s',
+                    [order.id, cart.id],
+                )
+                # Total and cleanup only look at the rows copied above, so products added
+                # to the cart concurrently are neither charged nor lost
+                cursor.execute(
+                    f'UPDATE {orders} SET total_amount = ('
+                    f'SELECT COALESCE(SUM(p.price_cents), 0) FROM {products} p '
+                    f'JOIN {order_products} op ON op.product_id = p.id WHERE op.order_id = %s'
+                    f') / 100.0 WHERE id = %s',
+                    [order.id, order.id],
+                )
+                cursor.execute(
+                    f'DELETE FROM {cart_products} WHERE cart_id = %s AND product_id IN ('
+                    f'SELECT product_id FROM {order_products} WHERE order_id = %s)',
+                    [cart.id, order.id],
+                )
 
         return Response({'message': 'Order created successfully'}, status=status.HTTP_201_CREATED)
 
@@ -190,20 +270,21 @@ class CancelOrder(APIView):
             return Response({'message': 'User is not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
 
         try:
-            order = Order.objects.get(id=order_id)
+            order = Order.objects.only('id', 'status', 'user_id').get(id=order_id)
             if order.status != 'Pending':
                 return Response({'message': 'The order cannot be cancelled'})
         except Order.DoesNotExist:
             return Response({'message': 'Order does not exist'}, status=status.HTTP_404_NOT_FOUND)
-        if order.user != user:
+        if order.user_id != user.id:
             return Response({'message': 'Bad User'}, status=status.HTTP_404_NOT_FOUND)
-        cart = Cart.objects.get(user=user)
-        products = order.products.prefetch_related()
-
-        for product in products:
-            cart.products.add(product)
-        cart.save()
-        order.delete()
+        cart = request.cart
+        if not cart:
+            return Response({'message': 'Cart does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            product_ids = list(order.products.values_list('id', flat=True))
+            cart.products.add(*product_ids)
+            order.delete()
+        prefetch_related_objects([cart], 'products')
         serializer = CartSerializer(cart)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -232,18 +313,65 @@ class CreateReviewView(APIView):
         user = request.user
         if not user.is_authenticated:
             return Response({'message': 'User is not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
+        if not Product.objects.filter(id=product_id).exists():
+            return Response({'message': 'Product does not exist'}, status=status.HTTP_404_NOT_FOUND)
         try:
-            product = Product.objects.get(id=product_id)
             text = request.data.get('text')
             rating = request.data.get('rating')
-        except Product.DoesNotExist:
-            return Response({'message': 'Product does not exist'}, status=status.HTTP_404_NOT_FOUND)
         except AttributeError:
             return Response({'message': 'Invalid data'}, status=status.HTTP_400_BAD_REQUEST)
-        review = Review.objects.create(user=user, product=product, text=text, rating=rating)
+        review = Review.objects.create(user=user, product_id=product_id, text=text, rating=rating)
         return Response({'message': 'Review successfully'}, status=status.HTTP_201_CREATED)
 
 
+REVIEW_BULK_MAX_SIZE = 1000
+
+
+class ReviewBulkCreateView(APIView):
+    """
+    View for creating several reviews in one request.
+
+    Attributes:
+        request: The request object containing a JSON list of reviews.
+    """
+
+    def post(self, request) -> Response:
+        """
+        Method to handle POST request for creating reviews in bulk.
+
+        Parameters:
+            request (Request): The request object with a list of at most REVIEW_BULK_MAX_SIZE
+                {'product_id', 'text', 'rating'} objects.
+
+        Returns:
+            Response: Response object indicating the result of the operation.
+        """
+        user = request.user
+        if not user.is_authenticated:
+            return Response({'message': 'User is not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        serializer = ReviewBulkSerializer(data=request.data, many=True, max_length=REVIEW_BULK_MAX_SIZE)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        reviews = serializer.validated_data
+
+        product_ids = {review['product_id'] for review in reviews}
+        existing_ids = set(Product.objects.filter(id__in=product_ids).values_list('id', flat=True))
+        missing_ids = product_ids - existing_ids
+        if missing_ids:
+            return Response({'message': 'Product does not exist', 'product_ids': sorted(missing_ids)},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        Review.objects.bulk_create(
+            [Review(user=user, product_id=review['product_id'], text=review['text'], rating=review['rating'])
+             for review in reviews],
+            batch_size=500,
+        )
+        # bulk_create() sends no post_save, so cached review stats are dropped here
+        transaction.on_commit(caches['products'].clear)
+        return Response({'message': 'Reviews successfully', 'count': len(reviews)}, status=status.HTTP_201_CREATED)
+
+
 class DeleteReviewView(generics.DestroyAPIView):
     """
     View for deleting a review for a product.
@@ -255,7 +383,7 @@ class DeleteReviewView(generics.DestroyAPIView):
     """
 
     serializer_class = ReviewSerializer
-    queryset = Review.objects.all()
+    queryset = Review.objects.select_related('user', 'product').all()
     permission_classes = [IsAuthenticated, IsOwner]
 
     def get_object(self):
@@ -267,7 +395,7 @@ class DeleteReviewView(generics.DestroyAPIView):
             Response: Response object indicating the result of the operation
         """
         try:
-            review = Review.objects.get(id=self.kwargs['review_id'])
+            review = self.get_queryset().get(id=self.kwargs['review_id'])
             self.check_object_permissions(self.request, review)
             return review
         except Review.DoesNotExist:
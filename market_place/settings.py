@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,6 +50,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'market.middleware.CartAttachMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -81,9 +83,52 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests instead of reconnecting every time
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# In production the API talks to PostgreSQL through pgbouncer (transaction pooling,
+# default_pool_size = 25), so HOST/PORT point at the pooler rather than the server.
+if os.environ.get('POSTGRES_DB'):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ['POSTGRES_DB'],
+        'USER': os.environ.get('POSTGRES_USER', ''),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '6432'),
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'CONN_HEALTH_CHECKS': True,
+        # Server-side cursors don't survive across pgbouncer transactions
+        'DISABLE_SERVER_SIDE_CURSORS': True,
+    }
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+# Serialized product list/detail data lives in its own cache so a product change can
+# clear it all at once without touching anything else. The LocMem default is
+# per-process: a change only clears the cache of the worker that handled it, and other
+# workers serve stale data until the timeout (60s list, 300s detail). Deployments with
+# several workers must set PRODUCTS_CACHE_URL to a shared Redis. Give it a dedicated
+# database: clearing the alias flushes that whole database.
+PRODUCTS_CACHE_URL = os.environ.get('PRODUCTS_CACHE_URL')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'products': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': PRODUCTS_CACHE_URL,
+    } if PRODUCTS_CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'products',
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -127,4 +172,6 @@ REST_FRAMEWORK = {
     # ВАШИ НАСТРОЙКИ
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': ('rest_framework.authentication.BasicAuthentication', 'rest_framework.authentication.SessionAuthentication'),
+    'DEFAULT_PAGINATION_CLASS': 'market.pagination.IdCursorPagination',
+    'PAGE_SIZE': 50,
 }